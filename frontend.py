@@ -1,12 +1,16 @@
+import io
 import streamlit as st
 import pandas as pd
+import numpy as np
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 
 # Import your main function
-from main import generate_leads
+from main import generate_leads, clear_caches, NoLeadsFound
 
 # Page configuration
 st.set_page_config(
@@ -16,8 +20,77 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Cached lead generation so repeated queries skip the scraping pipeline; empty
+# results (often transient network or API failures) raise instead and are retried
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_generate_leads(query: str, n: int) -> pd.DataFrame:
+    leads_df = generate_leads(query, n)
+    if leads_df.empty:
+        raise NoLeadsFound(query)
+    return leads_df
+
+# Shared worker pool so lead generation runs off the script thread
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4)
+
+# Normalise filter columns so comparisons run on categorical codes and bool masks
+def _normalize_leads(leads_df: pd.DataFrame) -> pd.DataFrame:
+    # LLM output mixes ints, "N/A", lists and dicts in one column; Arrow (Feather) and
+    # the category cast need a single value type, so such columns are stringified
+    for column in leads_df.columns:
+        if column == 'is_relevant' or leads_df[column].dtype != object:
+            continue
+        value_types = set(map(type, leads_df[column].dropna()))
+        if len(value_types) > 1 or any(issubclass(t, (list, dict, tuple, set)) for t in value_types):
+            leads_df[column] = leads_df[column].map(
+                lambda v: v if pd.api.types.is_scalar(v) and pd.isna(v) else str(v)
+            )
+    
+    if 'industry' in leads_df.columns:
+        leads_df['industry'] = leads_df['industry'].astype('category')
+    if 'is_relevant' in leads_df.columns:
+        leads_df['is_relevant'] = leads_df['is_relevant'].fillna(False).astype(bool)
+    return leads_df
+
+# Leads are kept in session state as a Feather buffer and decoded on demand
+@st.cache_data(max_entries=4, show_spinner=False)
+def _read_leads(buf: bytes) -> pd.DataFrame:
+    return pd.read_feather(io.BytesIO(buf))
+
+def _load_leads() -> pd.DataFrame:
+    buf = st.session_state.get('leads_buf')
+    return _read_leads(buf) if buf else pd.DataFrame()
+
+def _store_leads(leads_df: pd.DataFrame) -> None:
+    if leads_df.empty:
+        st.session_state.leads_buf = None
+        return
+    buf = io.BytesIO()
+    leads_df.reset_index(drop=True).to_feather(buf)
+    st.session_state.leads_buf = buf.getvalue()
+
+# CSV export is only rebuilt when the filtered frame changes
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _to_csv_gz(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, compression='gzip')
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _unique_industries(df: pd.DataFrame) -> list:
+    if 'industry' not in df.columns:
+        return []
+    return sorted(df['industry'].dropna().unique().tolist())
+
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%);
@@ -64,15 +137,17 @@ st.markdown("""
         border-left: 4px solid #2a5298;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-if 'leads_df' not in st.session_state:
-    st.session_state.leads_df = pd.DataFrame()
+if 'leads_buf' not in st.session_state:
+    st.session_state.leads_buf = None
 if 'search_history' not in st.session_state:
-    st.session_state.search_history = []
-if 'is_generating' not in st.session_state:
-    st.session_state.is_generating = False
+    st.session_state.search_history = deque(maxlen=5)
+if 'leads_future' not in st.session_state:
+    st.session_state.leads_future = None
 
 # Header
 st.markdown("""
@@ -95,12 +170,16 @@ with st.sidebar:
         st.info("Current settings optimized for best results")
         st.write("• Relevance threshold: 60%")
         st.write("• Max retries: 3")
-        st.write("• Scraping delay: 2 seconds")
+        st.write("• Parallel scrapers: 4")
+        if st.button("🧹 Clear cache", use_container_width=True):
+            _cached_generate_leads.clear()
+            clear_caches()
+            st.success("Cached results, pages and AI responses cleared")
     
     # Search history
     if st.session_state.search_history:
         st.subheader("📜 Search History")
-        for i, search in enumerate(reversed(st.session_state.search_history[-5:])):
+        for i, search in enumerate(reversed(st.session_state.search_history)):
             if st.button(f"🔍 {search['query'][:30]}...", key=f"history_{i}"):
                 st.session_state.search_query = search['query']
                 st.rerun()
@@ -144,8 +223,9 @@ with col2:
     st.subheader("📊 Quick Stats")
     
     # Display metrics
-    total_leads = len(st.session_state.leads_df)
-    relevant_leads = len(st.session_state.leads_df[st.session_state.leads_df.get('is_relevant', False) == True]) if not st.session_state.leads_df.empty else 0
+    df = _load_leads()
+    total_leads = len(df)
+    relevant_leads = int(df['is_relevant'].to_numpy(dtype=bool).sum()) if 'is_relevant' in df.columns and total_leads else 0
     
     col_metric1, col_metric2 = st.columns(2)
     with col_metric1:
@@ -159,9 +239,7 @@ with col2:
 
 # Search execution
 if search_button and search_query:
-    if not st.session_state.is_generating:
-        st.session_state.is_generating = True
-        
+    if st.session_state.leads_future is None:
         # Add to search history
         st.session_state.search_history.append({
             'query': search_query,
@@ -169,42 +247,59 @@ if search_button and search_query:
             'num_results': num_results
         })
         
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        try:
-            # Update progress
-            status_text.text("🔍 Searching for companies...")
-            progress_bar.progress(20)
-            
-            # Generate leads
-            with st.spinner("Generating leads... This may take a few minutes."):
-                leads_df = generate_leads(search_query, num_results)
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Lead generation complete!")
-            
-            # Store results
-            st.session_state.leads_df = leads_df
-            
-            # Success message
-            if not leads_df.empty:
-                st.success(f"🎉 Successfully generated {len(leads_df)} leads!")
-            else:
-                st.warning("⚠️ No leads found. Try a different search query.")
-                
-        except Exception as e:
-            st.error(f"❌ Error generating leads: {str(e)}")
-            st.info("Please check your API keys and internet connection.")
+        # Generate leads in the background; the fragment below polls for completion
+        st.session_state.leads_query = search_query
+        st.session_state.leads_future = _get_executor().submit(_cached_generate_leads, search_query, num_results)
+    else:
+        st.warning("⏳ Lead generation is already running. Please wait for it to finish.")
+
+@st.fragment(run_every=1.0)
+def _poll_leads():
+    future = st.session_state.leads_future
+    if future is None:
+        return
+    
+    if not future.done():
+        st.info(f"⏳ Generating leads for \"{st.session_state.leads_query}\"... This may take a few minutes.")
+        return
+    
+    st.session_state.leads_future = None
+    try:
+        leads_df = _normalize_leads(future.result())
         
-        finally:
-            progress_bar.empty()
-            status_text.empty()
-            st.session_state.is_generating = False
+        # Store results
+        _store_leads(leads_df)
+    except NoLeadsFound:
+        _store_leads(pd.DataFrame())
+        st.session_state.leads_notice = ("warning", "⚠️ No leads found. Try a different search query.")
+    except Exception as e:
+        st.session_state.leads_notice = ("error", f"❌ Error generating leads: {str(e)}")
+    else:
+        st.session_state.leads_notice = ("success", f"🎉 Successfully generated {len(leads_df)} leads!")
+    st.rerun()
+
+if st.session_state.leads_future is not None:
+    _poll_leads()
 
-# Display results
-if not st.session_state.leads_df.empty:
+# Outcome of the last completed generation
+notice = st.session_state.pop('leads_notice', None)
+if notice:
+    kind, message = notice
+    if kind == "success":
+        st.success(message)
+    elif kind == "warning":
+        st.warning(message)
+    else:
+        st.error(message)
+        st.info("Please check your API keys and internet connection.")
+
+# Display results; filter and detail widgets rerun only this fragment
+@st.fragment
+def results_panel():
+    leads_df = _load_leads()
+    if leads_df.empty:
+        return
+    
     st.header("📋 Generated Leads")
     
     # Filter options
@@ -216,20 +311,22 @@ if not st.session_state.leads_df.empty:
     with col_filter2:
         industry_filter = st.selectbox(
             "Filter by Industry",
-            ["All"] + list(st.session_state.leads_df['industry'].unique()) if 'industry' in st.session_state.leads_df.columns else ["All"]
+            ["All"] + _unique_industries(leads_df)
         )
     
     with col_filter3:
-        download_format = st.selectbox("Download Format", ["CSV", "Excel"])
+        download_format = st.selectbox("Download Format", ["CSV", "CSV (gzipped)", "Excel"])
     
-    # Apply filters
-    filtered_df = st.session_state.leads_df.copy()
+    # Apply filters as a single combined mask
+    mask = np.ones(len(leads_df), dtype=bool)
     
-    if show_relevant_only and 'is_relevant' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['is_relevant'] == True]
+    if show_relevant_only and 'is_relevant' in leads_df.columns:
+        mask &= leads_df['is_relevant'].to_numpy(dtype=bool)
     
-    if industry_filter != "All" and 'industry' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['industry'] == industry_filter]
+    if industry_filter != "All" and 'industry' in leads_df.columns:
+        mask &= (leads_df['industry'] == industry_filter).to_numpy()
+    
+    filtered_df = leads_df if mask.all() else leads_df[mask]
     
     # Display filtered results
     if not filtered_df.empty:
@@ -239,16 +336,22 @@ if not st.session_state.leads_df.empty:
         display_columns = ['company_name', 'email', 'phone', 'linkedin', 'website', 'industry', 'description']
         available_display_columns = [col for col in display_columns if col in filtered_df.columns]
         
+        # Paginate server-side so only the visible page is serialized
+        page_size = 25
+        num_pages = max(1, (len(filtered_df) + page_size - 1) // page_size)
+        page = st.number_input("Page", min_value=1, max_value=num_pages, value=1) if num_pages > 1 else 1
+        page_df = filtered_df.iloc[(page - 1) * page_size:page * page_size]
+        
         # Display the dataframe
         st.dataframe(
-            filtered_df[available_display_columns],
+            page_df[available_display_columns],
             use_container_width=True,
             hide_index=True
         )
         
         # Download button
         if download_format == "CSV":
-            csv = filtered_df.to_csv(index=False)
+            csv = _to_csv_bytes(filtered_df)
             st.download_button(
                 label="📥 Download CSV",
                 data=csv,
@@ -256,6 +359,14 @@ if not st.session_state.leads_df.empty:
                 mime="text/csv",
                 use_container_width=True
             )
+        elif download_format == "CSV (gzipped)":
+            st.download_button(
+                label="📥 Download CSV (gzipped)",
+                data=_to_csv_gz(filtered_df),
+                file_name=f"leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv.gz",
+                mime="application/gzip",
+                use_container_width=True
+            )
         else:
             # For Excel download, you'd need to install openpyxl
             st.info("Excel download requires openpyxl package. Use CSV for now.")
@@ -265,56 +376,66 @@ if not st.session_state.leads_df.empty:
         
         # Lead selection
         if len(filtered_df) > 0:
+            lead_names = filtered_df['company_name'].tolist()
             selected_lead_idx = st.selectbox(
                 "Select a lead to view details:",
                 range(len(filtered_df)),
-                format_func=lambda x: filtered_df.iloc[x]['company_name']
+                format_func=lead_names.__getitem__
             )
             
             selected_lead = filtered_df.iloc[selected_lead_idx]
+            row = {
+                k: 'N/A' if pd.api.types.is_scalar(v) and pd.isna(v) else v
+                for k, v in selected_lead.to_dict().items()
+            }
+            relevance_confidence = row.get('relevance_confidence', 0)
+            if not isinstance(relevance_confidence, (int, float)):
+                relevance_confidence = 0
             
             # Display selected lead details
             col_detail1, col_detail2 = st.columns(2)
             
             with col_detail1:
                 st.markdown(f"""
-                **Company:** {selected_lead.get('company_name', 'N/A')}
+                **Company:** {row.get('company_name', 'N/A')}
                 
-                **Industry:** {selected_lead.get('industry', 'N/A')}
+                **Industry:** {row.get('industry', 'N/A')}
                 
-                **Email:** {selected_lead.get('email', 'N/A')}
+                **Email:** {row.get('email', 'N/A')}
                 
-                **Phone:** {selected_lead.get('phone', 'N/A')}
+                **Phone:** {row.get('phone', 'N/A')}
                 
-                **LinkedIn:** {selected_lead.get('linkedin', 'N/A')}
+                **LinkedIn:** {row.get('linkedin', 'N/A')}
                 
-                **Website:** {selected_lead.get('website', 'N/A')}
+                **Website:** {row.get('website', 'N/A')}
                 """)
             
             with col_detail2:
                 st.markdown(f"""
-                **Address:** {selected_lead.get('address', 'N/A')}
+                **Address:** {row.get('address', 'N/A')}
                 
-                **Contact Person:** {selected_lead.get('contact_person', 'N/A')}
+                **Contact Person:** {row.get('contact_person', 'N/A')}
                 
-                **Company Size:** {selected_lead.get('company_size', 'N/A')}
+                **Company Size:** {row.get('company_size', 'N/A')}
                 
-                **Founded:** {selected_lead.get('founded_year', 'N/A')}
+                **Founded:** {row.get('founded_year', 'N/A')}
                 
-                **Services:** {selected_lead.get('services', 'N/A')}
+                **Services:** {row.get('services', 'N/A')}
                 
-                **Relevance:** {selected_lead.get('relevance_confidence', 0):.1%}
+                **Relevance:** {relevance_confidence:.1%}
                 """)
             
             # Description
-            if selected_lead.get('description', 'N/A') != 'N/A':
+            if row.get('description', 'N/A') != 'N/A':
                 st.markdown(f"""
                 **Description:**
-                {selected_lead.get('description', 'N/A')}
+                {row.get('description', 'N/A')}
                 """)
     else:
         st.info("No leads match your current filters.")
 
+results_panel()
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -1,17 +1,23 @@
 import os
-import requests
+import asyncio
+import httpx
 import csv
-import time
-import json
+import orjson
+import queue
+import threading
+import hashlib
+import diskcache
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
-from groq import Groq
-from bs4 import BeautifulSoup
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from groq import AsyncGroq
+from selectolax.lexbor import LexborHTMLParser
 import re
 from urllib.parse import urljoin, urlparse
 import logging
+import logging.handlers
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -20,20 +26,120 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('lead_generation.log'),
+        logging.handlers.RotatingFileHandler('lead_generation.log', maxBytes=10_000_000, backupCount=3, delay=True),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Column order of the generated leads DataFrame
+_LEAD_COLUMNS = (
+    "company_name", "email", "phone", "linkedin", "website", "industry",
+    "description", "address", "contact_person", "services", "company_size",
+    "founded_year", "revenue_range", "technologies", "social_media",
+    "is_relevant", "relevance_confidence", "relevance_reason",
+    "search_title", "search_snippet", "scraped_at"
+)
+
+# Groq model used for all chat completions
+_GROQ_MODEL = "llama-3.1-8b-instant"
+
+# Serper responses worth retrying, and the bounded exponential backoff between attempts
+_SERPER_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_SERPER_MAX_ATTEMPTS = 4
+_SERPER_BACKOFF_SECONDS = 0.5
+
+# Search results sent to Groq per relevance call, and snippet length kept per result
+_RELEVANCE_BATCH_SIZE = 10
+_RELEVANCE_SNIPPET_CHARS = 120
+
+# Static prompt instructions are sent first (as the system message) so Groq can
+# cache the shared prefix; per-call data goes in the user message at the tail.
+_RELEVANCE_PROMPT_PREFIX = """
+Analyze the search results provided by the user and determine their relevance to the user's search query.
+Each search result has an index (i), a title (t) and a snippet (s).
+
+For each result, evaluate if it matches what the user is looking for based on:
+1. Company type/industry alignment
+2. Geographic relevance (if specified)
+3. Business model relevance
+4. Overall match to search intent
+
+Return a JSON object with a "results" array, where each entry has:
+- index: The result index (i)
+- is_relevant: true/false
+- confidence: 0.0-1.0 (how confident you are)
+- reason: Brief explanation of relevance decision
+
+Return only valid JSON format.
+"""
+
+_REFINE_PROMPT_PREFIX = """
+The user's original search query returned mostly irrelevant results.
+
+Generate a more specific and targeted search query that would return better results.
+Consider:
+1. Adding more specific keywords
+2. Including location modifiers if needed
+3. Adding industry-specific terms
+4. Excluding common irrelevant terms
+
+Return only the refined search query as plain text, no explanation.
+"""
+
+_EXTRACT_PROMPT_PREFIX = """
+Analyze the website content provided by the user and extract comprehensive lead generation information.
+
+Return information in JSON format with these fields:
+- company_name: The main company name
+- email: Email addresses (comma-separated if multiple, prioritize contact/sales emails)
+- phone: Phone numbers (comma-separated if multiple, format: +1-XXX-XXX-XXXX)
+- linkedin: LinkedIn company page or key personnel URLs
+- website: The website URL
+- industry: Specific industry/business type
+- description: Compelling company description (50-100 words)
+- address: Full physical address
+- contact_person: Names and titles of key contacts
+- services: Main services/products (comma-separated)
+- company_size: Employee count estimate or range
+- founded_year: Year company was founded
+- revenue_range: Estimated revenue range if available
+- technologies: Key technologies used (if tech company)
+- social_media: Other social media profiles (Twitter, Facebook, etc.)
+
+Return only valid JSON. Use "N/A" for missing information.
+"""
+
+# Patterns for the regex fallback extraction
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_PHONE_RE = re.compile(r'(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})')
+_LINKEDIN_RE = re.compile(r'https?://(?:www\.)?linkedin\.com/(?:company|in)/[A-Za-z0-9_-]+')
+
+# Upper bound on raw HTML handed to the parser; only the first 8000 chars of text are kept anyway
+_MAX_HTML_CHARS = 512 * 1024
+_WS_RE = re.compile(r'\s+')
+
+# Pages with less visible text than this are JS walls or login pages; skip the LLM for them
+_MIN_EXTRACT_CHARS = 300
+
+# Markers of pages that only render their content with JavaScript
+_JS_REQUIRED_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript must be enabled",
+)
+
+class NoLeadsFound(Exception):
+    """Raised by callers that must not cache an empty lead result"""
+
 class EnhancedLeadGenerationTool:
     def __init__(self):
         # API Keys
         self.GROQ_API_KEY = "put your api here"
         self.SERPER_API_KEY = "put your api here"
         
-        # Initialize Groq client
-        self.groq_client = Groq(api_key=self.GROQ_API_KEY)
+        # Browser-like user agent shared by the HTTP client and Chrome
+        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         
         # Setup Chrome options for Selenium
         self.chrome_options = Options()
@@ -45,17 +151,118 @@ class EnhancedLeadGenerationTool:
         self.chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
-        self.chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        self.chrome_options.add_argument(f"user-agent={self.user_agent}")
+        
+        # Only DOM text is needed, so skip downloading images, stylesheets and fonts
+        self.chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        self.chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2
+        })
         
         # Configuration
         self.max_retries = 3
         self.relevance_threshold = 0.6  # 60% of results must be relevant
+        self.max_workers = 4  # Concurrent scrapers, each with its own Chrome
+        self.max_concurrent_llm_calls = 8  # Concurrent Groq calls
+        
+        # Persistent caches so re-runs skip scraping and Groq calls for recently seen inputs
+        self.cache_ttl = 24 * 60 * 60
+        self._page_cache = diskcache.Cache('./.scrape_cache', size_limit=2_000_000_000)
+        self._llm_cache = diskcache.Cache('./.llm_cache', size_limit=500_000_000)
+        
+        # Pool of long-lived Chrome drivers, created lazily by the scraper threads
+        self._driver_pool = queue.Queue()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+        
+        # Async clients and limits are bound to an event loop, so they are opened per run
+        self.http = None
+        self.async_groq = None
+        self._llm_semaphore = None
+        self._browser_semaphore = None
+        self._extractions = {}  # Content hash -> extraction task, reset every run
         
         logger.info("Enhanced Lead Generation Tool initialized")
     
-    def search_companies(self, query: str, num_results: int = 10) -> List[Dict]:
+    def _chat_cache_key(self, messages: List[Dict], model: str, temperature: float, max_tokens: int,
+                        json_mode: bool) -> Optional[str]:
+        """Response-cache key for deterministic (temperature <= 0.1) calls, None otherwise"""
+        if temperature > 0.1:
+            return None
+        return hashlib.sha256(orjson.dumps({
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "json_mode": json_mode
+        }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _log_usage(self, chat_completion) -> None:
+        """Surface how much of the prompt Groq served from its prefix cache"""
+        usage = getattr(chat_completion, "usage", None)
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None) or 0
+            logger.info("📈 Groq usage: %s prompt tokens (%s cached), %s completion tokens", usage.prompt_tokens, cached_tokens, usage.completion_tokens)
+    
+    async def _groq_chat(self, messages: List[Dict], model: str, temperature: float, max_tokens: int,
+                         json_mode: bool = False) -> str:
+        """Call Groq chat completions, serving deterministic prompts from the response cache"""
+        cache_key = self._chat_cache_key(messages, model, temperature, max_tokens, json_mode)
+        if cache_key is not None:
+            cached = self._llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info("♻️ Using cached Groq response")
+                return cached
+        
+        extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
+        async with self._llm_semaphore:
+            chat_completion = await self.async_groq.chat.completions.create(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra_args
+            )
+        response_text = chat_completion.choices[0].message.content
+        self._log_usage(chat_completion)
+        
+        if cache_key is not None:
+            self._llm_cache.set(cache_key, response_text, expire=self.cache_ttl)
+        return response_text
+    
+    async def _open_clients(self) -> None:
+        """Open the HTTP/2 client, AsyncGroq client and concurrency limits for one run"""
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+        self.http = httpx.AsyncClient(
+            transport=transport,
+            timeout=30.0,
+            follow_redirects=True,
+            headers={"User-Agent": self.user_agent}
+        )
+        self.async_groq = AsyncGroq(api_key=self.GROQ_API_KEY)
+        self._llm_semaphore = asyncio.Semaphore(self.max_concurrent_llm_calls)
+        self._browser_semaphore = asyncio.Semaphore(self.max_workers)
+        self._extractions = {}
+    
+    async def _close_clients(self) -> None:
+        """Close the async clients opened by _open_clients"""
+        if self.http is not None:
+            await self.http.aclose()
+            self.http = None
+        if self.async_groq is not None:
+            await self.async_groq.close()
+            self.async_groq = None
+    
+    async def search_companies(self, query: str, num_results: int = 10) -> List[Dict]:
         """Search for companies using Serper API with improved error handling"""
-        logger.info(f"🔍 Searching for: {query}")
+        logger.info("🔍 Searching for: %s", query)
         
         url = "https://google.serper.dev/search"
         headers = {
@@ -69,83 +276,76 @@ class EnhancedLeadGenerationTool:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            for attempt in range(_SERPER_MAX_ATTEMPTS):
+                response = await self.http.post(url, headers=headers, json=data)
+                if response.status_code not in _SERPER_RETRY_STATUSES or attempt == _SERPER_MAX_ATTEMPTS - 1:
+                    break
+                delay = _SERPER_BACKOFF_SECONDS * 2 ** attempt
+                logger.warning("⚠️ Search API returned %s, retrying in %.1fs", response.status_code, delay)
+                await asyncio.sleep(delay)
             response.raise_for_status()
-            results = response.json().get("organic", [])
+            results = orjson.loads(response.content).get("organic", [])
             
-            logger.info(f"✅ Found {len(results)} search results")
+            logger.info("✅ Found %d search results", len(results))
             return results
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Search API request failed: {e}")
+        except httpx.HTTPError as e:
+            logger.error("❌ Search API request failed: %s", e)
             return []
         except Exception as e:
-            logger.error(f"❌ Unexpected search error: {e}")
+            logger.error("❌ Unexpected search error: %s", e)
             return []
     
-    def evaluate_relevance(self, search_results: List[Dict], original_query: str) -> List[Dict]:
-        """Evaluate relevance of search results using Groq LLM"""
-        logger.info("🤖 Evaluating relevance of search results...")
-        
-        # Prepare results summary for LLM
-        results_summary = []
-        for i, result in enumerate(search_results):
-            results_summary.append({
-                "index": i,
-                "title": result.get("title", ""),
-                "snippet": result.get("snippet", ""),
-                "link": result.get("link", "")
-            })
-        
+    async def _evaluate_relevance_batch(self, results_summary: List[Dict], original_query: str) -> List[Dict]:
+        """Ask Groq to score one batch of summarized search results"""
         prompt = f"""
-        Analyze the following search results and determine their relevance to the search query: "{original_query}"
-        
-        For each result, evaluate if it matches what the user is looking for based on:
-        1. Company type/industry alignment
-        2. Geographic relevance (if specified)
-        3. Business model relevance
-        4. Overall match to search intent
-        
-        Return a JSON array where each object has:
-        - index: The result index
-        - is_relevant: true/false
-        - confidence: 0.0-1.0 (how confident you are)
-        - reason: Brief explanation of relevance decision
+        Search query: "{original_query}"
         
         Search Results:
-        {json.dumps(results_summary, indent=2)}
-        
-        Return only valid JSON format.
+        {orjson.dumps(results_summary).decode()}
         """
         
+        response_text = await self._groq_chat(
+            messages=[
+                {"role": "system", "content": _RELEVANCE_PROMPT_PREFIX},
+                {"role": "user", "content": prompt}
+            ],
+            model=_GROQ_MODEL,
+            temperature=0,
+            max_tokens=1000,
+            json_mode=True
+        )
+        return orjson.loads(response_text).get("results", [])
+    
+    async def evaluate_relevance(self, search_results: List[Dict], original_query: str) -> List[Dict]:
+        """Evaluate relevance of search results using Groq LLM"""
+        logger.info("🤖 Evaluating relevance of search results...")
+        
+        # Prepare a compact results summary for the LLM; links are not needed for scoring
+        results_summary = [
+            {"i": i, "t": result.get("title", ""), "s": result.get("snippet", "")[:_RELEVANCE_SNIPPET_CHARS]}
+            for i, result in enumerate(search_results)
+        ]
+        batches = [
+            results_summary[start:start + _RELEVANCE_BATCH_SIZE]
+            for start in range(0, len(results_summary), _RELEVANCE_BATCH_SIZE)
+        ]
+        
         try:
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama3-8b-8192",
-                temperature=0.1,
-                max_tokens=2000
+            # Score batches concurrently and merge their results
+            batch_results = await asyncio.gather(
+                *(self._evaluate_relevance_batch(batch, original_query) for batch in batches)
             )
-            
-            response_text = chat_completion.choices[0].message.content
-            
-            # Extract JSON from response
-            json_start = response_text.find('[')
-            json_end = response_text.rfind(']') + 1
-            json_str = response_text[json_start:json_end]
-            
-            relevance_data = json.loads(json_str)
+            relevance_data = [rel_data for batch in batch_results for rel_data in batch]
             
             # Add relevance info to original results
+            relevance_by_index = {rel_data.get("index"): rel_data for rel_data in relevance_data}
             enhanced_results = []
-            for result in search_results:
+            for i, result in enumerate(search_results):
                 enhanced_result = result.copy()
                 
                 # Find matching relevance data
-                relevance_info = None
-                for rel_data in relevance_data:
-                    if rel_data.get("index") == search_results.index(result):
-                        relevance_info = rel_data
-                        break
+                relevance_info = relevance_by_index.get(i)
                 
                 if relevance_info:
                     enhanced_result["is_relevant"] = relevance_info.get("is_relevant", False)
@@ -163,175 +363,283 @@ class EnhancedLeadGenerationTool:
             total_count = len(enhanced_results)
             relevance_rate = relevant_count / total_count if total_count > 0 else 0
             
-            logger.info(f"✅ Relevance evaluation complete: {relevant_count}/{total_count} relevant ({relevance_rate:.1%})")
+            logger.info("✅ Relevance evaluation complete: %s/%s relevant (%.1f%%)", relevant_count, total_count, relevance_rate * 100)
             
             return enhanced_results
             
         except Exception as e:
-            logger.error(f"❌ Relevance evaluation failed: {e}")
+            logger.error("❌ Relevance evaluation failed: %s", e)
             # Return original results with default relevance
             return [{**result, "is_relevant": True, "relevance_confidence": 0.5, "relevance_reason": "Could not evaluate"} 
                     for result in search_results]
     
-    def refine_search_query(self, original_query: str, failed_results: List[Dict]) -> str:
+    async def refine_search_query(self, original_query: str, failed_results: List[Dict]) -> str:
         """Generate a refined search query based on failed results"""
         logger.info("🔍 Refining search query based on irrelevant results...")
         
         failed_titles = [result.get("title", "") for result in failed_results if not result.get("is_relevant", True)]
         
+        # Refinements are sampled (temperature 0.3), so remember the first one per input
+        cache_key = "refine:" + hashlib.sha256(orjson.dumps([original_query, sorted(failed_titles)])).hexdigest()
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("♻️ Reusing refined query: %s", cached)
+            return cached
+        
         prompt = f"""
-        The original search query "{original_query}" returned mostly irrelevant results.
+        Original search query: "{original_query}"
         
         Irrelevant results included:
-        {json.dumps(failed_titles, indent=2)}
-        
-        Generate a more specific and targeted search query that would return better results.
-        Consider:
-        1. Adding more specific keywords
-        2. Including location modifiers if needed
-        3. Adding industry-specific terms
-        4. Excluding common irrelevant terms
-        
-        Return only the refined search query as plain text, no explanation.
+        {orjson.dumps(failed_titles).decode()}
         """
         
         try:
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama3-8b-8192",
+            response_text = await self._groq_chat(
+                messages=[
+                    {"role": "system", "content": _REFINE_PROMPT_PREFIX},
+                    {"role": "user", "content": prompt}
+                ],
+                model=_GROQ_MODEL,
                 temperature=0.3,
                 max_tokens=100
             )
             
-            refined_query = chat_completion.choices[0].message.content.strip()
-            logger.info(f"✅ Refined query: {refined_query}")
+            refined_query = response_text.strip()
+            self._llm_cache.set(cache_key, refined_query, expire=self.cache_ttl)
+            logger.info("✅ Refined query: %s", refined_query)
             return refined_query
             
         except Exception as e:
-            logger.error(f"❌ Query refinement failed: {e}")
+            logger.error("❌ Query refinement failed: %s", e)
             return original_query + " company contact information"
     
     def clean_html_content(self, html_content: str) -> str:
         """Clean and extract meaningful text from HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        tree = LexborHTMLParser(html_content[:_MAX_HTML_CHARS])
         
         # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "footer", "header", "aside", "noscript"]):
-            element.decompose()
+        for node in tree.css("script, style, nav, footer, header, aside, noscript"):
+            node.decompose()
         
         # Get text content
-        text = soup.get_text()
+        root = tree.body or tree.root
+        text = root.text(separator=' ', strip=True) if root else ''
         
         # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        text = _WS_RE.sub(' ', text).strip()
         
         # Limit text length for LLM
         return text[:8000]
     
-    def scrape_website(self, url: str) -> Optional[str]:
+    async def _fetch_static(self, url: str) -> Optional[str]:
+        """Fetch a page over plain HTTP, returning None when it needs a real browser"""
+        try:
+            response = await self.http.get(url, timeout=15)
+            response.raise_for_status()
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            logger.info("Static fetch failed for %s, falling back to Chrome: %s", url, e)
+            return None
+        
+        if "html" not in response.headers.get("Content-Type", ""):
+            return None
+        
+        html_content = response.text
+        if len(html_content) <= 2000:
+            return None
+        
+        cleaned_content = self.clean_html_content(html_content)
+        lowered = cleaned_content[:1000].lower()
+        if len(cleaned_content) < 500 or any(marker in lowered for marker in _JS_REQUIRED_MARKERS):
+            return None
+        
+        logger.info("✅ Fetched %d characters from %s without a browser", len(cleaned_content), url)
+        return cleaned_content
+    
+    def _new_driver(self) -> webdriver.Chrome:
+        """Start a Chrome driver with anti-detection tweaks applied"""
+        driver = webdriver.Chrome(options=self.chrome_options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        # Set page load timeout
+        driver.set_page_load_timeout(30)
+        
+        with self._drivers_lock:
+            self._drivers.append(driver)
+        return driver
+    
+    def _acquire_driver(self) -> webdriver.Chrome:
+        """Take an idle driver from the pool, starting a new one if none is free"""
+        # A driver is only ever used by the thread that checked it out, so Selenium's
+        # single-connection urllib3 pool per driver never has to queue commands.
+        try:
+            return self._driver_pool.get_nowait()
+        except queue.Empty:
+            return self._new_driver()
+    
+    def _release_driver(self, driver: webdriver.Chrome) -> None:
+        """Return a driver to the pool, discarding it if the browser has died"""
+        try:
+            driver.delete_all_cookies()
+        except Exception:
+            with self._drivers_lock:
+                if driver in self._drivers:
+                    self._drivers.remove(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+        self._driver_pool.put(driver)
+    
+    def __enter__(self) -> "EnhancedLeadGenerationTool":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Quit every Chrome driver started by this tool"""
+        with self._drivers_lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._driver_pool = queue.Queue()
+        self._page_cache.close()
+        self._llm_cache.close()
+    
+    def clear_caches(self) -> None:
+        """Drop every cached page and Groq response so the next run fetches fresh data"""
+        self._page_cache.clear()
+        self._llm_cache.clear()
+        logger.info("🧹 Cleared page and Groq response caches")
+    
+    def scrape_website(self, url: str, driver: webdriver.Chrome) -> Optional[str]:
         """Scrape website content using Selenium with better error handling"""
-        logger.info(f"🌐 Scraping: {url}")
+        logger.info("🌐 Scraping: %s", url)
         
-        driver = None
         try:
-            driver = webdriver.Chrome(options=self.chrome_options)
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # Set page load timeout
-            driver.set_page_load_timeout(30)
-            
-            driver.get(url)
-            time.sleep(5)  # Wait for JS to load
+            # Load the page in a fresh tab of the long-lived browser, then close it
+            original_window = driver.current_window_handle
+            driver.switch_to.new_window('tab')
+            try:
+                driver.get(url)
+                
+                # Wait for the document to finish loading; partial content is better than none
+                try:
+                    WebDriverWait(driver, 10).until(
+                        lambda d: d.execute_script("return document.readyState") == "complete"
+                    )
+                except TimeoutException:
+                    logger.warning("⚠️ Timed out waiting for %s to finish loading, using partial content", url)
+                
+                html_content = driver.page_source
+            finally:
+                driver.close()
+                driver.switch_to.window(original_window)
             
-            html_content = driver.page_source
             cleaned_content = self.clean_html_content(html_content)
             
-            logger.info(f"✅ Scraped {len(cleaned_content)} characters from {url}")
+            logger.info("✅ Scraped %d characters from %s", len(cleaned_content), url)
             return cleaned_content
             
         except WebDriverException as e:
-            logger.error(f"❌ WebDriver error for {url}: {e}")
+            logger.error("❌ WebDriver error for %s: %s", url, e)
             return None
         except Exception as e:
-            logger.error(f"❌ Unexpected error scraping {url}: {e}")
+            logger.error("❌ Unexpected error scraping %s: %s", url, e)
+            return None
+    
+    async def _fetch_page(self, url: str) -> Optional[str]:
+        """Try the page cache and static HTTP fast path first, using Chrome only for JS-rendered pages"""
+        content = self._page_cache.get(url)
+        if content is not None:
+            logger.info("♻️ Using cached content for %s", url)
+            return content
+        
+        content = await self._fetch_static(url)
+        if content is None:
+            # Selenium is blocking, so run it on a worker thread, one per pooled browser
+            async with self._browser_semaphore:
+                content = await asyncio.to_thread(self._scrape_with_pool, url)
+        
+        if content:
+            self._page_cache.set(url, content, expire=self.cache_ttl)
+        return content
+    
+    def _scrape_with_pool(self, url: str) -> Optional[str]:
+        """Scrape a URL with a driver borrowed from the pool"""
+        try:
+            driver = self._acquire_driver()
+        except WebDriverException as e:
+            logger.error("❌ Could not start Chrome for %s: %s", url, e)
             return None
+        try:
+            return self.scrape_website(url, driver)
         finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+            self._release_driver(driver)
+    
+    async def extract_lead_info(self, content: str, website_url: str) -> Dict:
+        """Extract lead information, skipping the LLM for near-empty or already-seen content"""
+        if len(content) < _MIN_EXTRACT_CHARS:
+            logger.info("Content from %s is too short for AI extraction, using fallback", website_url)
+            return self._create_fallback_lead_data(website_url, content)
+        
+        # Mirror sites serve identical content; extract it once per run
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        extraction = self._extractions.get(content_hash)
+        if extraction is None:
+            extraction = asyncio.ensure_future(self._extract_with_llm(content, website_url))
+            self._extractions[content_hash] = extraction
+        else:
+            logger.info("♻️ Content from %s was already extracted this run", website_url)
+        
+        # The shared result carries the first URL's website; report this page's own
+        lead_data = dict(await extraction)
+        lead_data['website'] = website_url
+        return lead_data
     
-    def extract_lead_info(self, content: str, website_url: str) -> Dict:
+    async def _extract_with_llm(self, content: str, website_url: str) -> Dict:
         """Extract lead information using Groq LLM with enhanced prompting"""
         logger.info("🤖 Extracting lead information with AI...")
         
         prompt = f"""
-        Analyze the following website content and extract comprehensive lead generation information.
-        
-        Return information in JSON format with these fields:
-        - company_name: The main company name
-        - email: Email addresses (comma-separated if multiple, prioritize contact/sales emails)
-        - phone: Phone numbers (comma-separated if multiple, format: +1-XXX-XXX-XXXX)
-        - linkedin: LinkedIn company page or key personnel URLs
-        - website: The website URL
-        - industry: Specific industry/business type
-        - description: Compelling company description (50-100 words)
-        - address: Full physical address
-        - contact_person: Names and titles of key contacts
-        - services: Main services/products (comma-separated)
-        - company_size: Employee count estimate or range
-        - founded_year: Year company was founded
-        - revenue_range: Estimated revenue range if available
-        - technologies: Key technologies used (if tech company)
-        - social_media: Other social media profiles (Twitter, Facebook, etc.)
-        
         Website URL: {website_url}
         
         Content:
         {content}
-        
-        Return only valid JSON. Use "N/A" for missing information.
         """
         
         try:
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama3-8b-8192",
-                temperature=0.1,
-                max_tokens=1500
+            response_text = await self._groq_chat(
+                messages=[
+                    {"role": "system", "content": _EXTRACT_PROMPT_PREFIX},
+                    {"role": "user", "content": prompt}
+                ],
+                model=_GROQ_MODEL,
+                temperature=0,
+                max_tokens=900,
+                json_mode=True
             )
             
-            response_text = chat_completion.choices[0].message.content
-            
-            # Extract JSON from response
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            json_str = response_text[json_start:json_end]
-            
-            lead_data = json.loads(json_str)
+            lead_data = orjson.loads(response_text)
             logger.info("✅ Successfully extracted lead information")
             return lead_data
             
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error("❌ Failed to parse JSON from LLM response")
             return self._create_fallback_lead_data(website_url, content)
         except Exception as e:
-            logger.error(f"❌ LLM extraction failed: {e}")
+            logger.error("❌ LLM extraction failed: %s", e)
             return self._create_fallback_lead_data(website_url, content)
     
     def _create_fallback_lead_data(self, website_url: str, content: str) -> Dict:
         """Create fallback lead data with enhanced regex extraction"""
-        # Enhanced regex patterns
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-        linkedin_pattern = r'https?://(?:www\.)?linkedin\.com/(?:company|in)/[A-Za-z0-9_-]+'
-        
-        emails = re.findall(email_pattern, content)
-        phones = re.findall(phone_pattern, content)
-        linkedin_urls = re.findall(linkedin_pattern, content)
+        emails = _EMAIL_RE.findall(content)
+        phones = _PHONE_RE.findall(content)
+        linkedin_urls = _LINKEDIN_RE.findall(content)
         
         # Extract company name from domain
         domain = urlparse(website_url).netloc.replace('www.', '')
@@ -357,38 +665,75 @@ class EnhancedLeadGenerationTool:
     
     def generate_leads_dataframe(self, search_query: str, num_results: int = 5) -> pd.DataFrame:
         """Main function to generate leads and return as pandas DataFrame"""
+        return asyncio.run(self._run_pipeline(search_query, num_results))
+    
+    async def _run_pipeline(self, search_query: str, num_results: int) -> pd.DataFrame:
+        """Run the whole lead generation pipeline on a single event loop"""
+        await self._open_clients()
+        try:
+            return await self._generate_leads(search_query, num_results)
+        finally:
+            await self._close_clients()
+    
+    async def _fetch_and_extract(self, url: str) -> Optional[Dict]:
+        """Fetch a page and extract its lead information, or None if it could not be fetched"""
+        # Contain failures to this page so one bad URL cannot fail the whole batch
+        try:
+            content = await self._fetch_page(url)
+            if not content:
+                return None
+            return await self.extract_lead_info(content, url)
+        except Exception as e:
+            logger.error("❌ Failed to process %s: %s", url, e)
+            return None
+    
+    async def _generate_leads(self, search_query: str, num_results: int) -> pd.DataFrame:
+        """Search, evaluate, scrape and extract leads for a query"""
         logger.info("🚀 Starting Enhanced AI-Powered Lead Generation...")
-        logger.info(f"Query: {search_query}")
-        logger.info(f"Target Results: {num_results}")
+        logger.info("Query: %s", search_query)
+        logger.info("Target Results: %s", num_results)
         logger.info("-" * 50)
         
         current_query = search_query
         retry_count = 0
+        evaluated_results = []
+        relevant_by_link = {}  # Relevant results kept across attempts, in discovery order
         
         while retry_count < self.max_retries:
-            logger.info(f"Attempt {retry_count + 1}/{self.max_retries}")
+            logger.info("Attempt %s/%s", retry_count + 1, self.max_retries)
             
             # Step 1: Search for companies
-            search_results = self.search_companies(current_query, num_results * 2)
+            search_results = await self.search_companies(current_query, num_results * 2)
             
             if not search_results:
+                if relevant_by_link:
+                    logger.warning("⚠️ No search results for refined query, proceeding with earlier results")
+                    break
                 logger.error("❌ No search results found")
                 return pd.DataFrame()
             
             # Step 2: Evaluate relevance
-            evaluated_results = self.evaluate_relevance(search_results, search_query)
+            evaluated_results = await self.evaluate_relevance(search_results, search_query)
             
             # Step 3: Check if we have enough relevant results
             relevant_results = [r for r in evaluated_results if r.get("is_relevant", False)]
             relevance_rate = len(relevant_results) / len(evaluated_results) if evaluated_results else 0
+            for result in relevant_results:
+                relevant_by_link.setdefault(result.get("link"), result)
             
             if relevance_rate >= self.relevance_threshold:
-                logger.info(f"✅ Sufficient relevance rate: {relevance_rate:.1%}")
+                logger.info("✅ Sufficient relevance rate: %.1f%%", relevance_rate * 100)
+                break
+            elif len(relevant_by_link) >= num_results:
+                logger.info("✅ Collected %d relevant results across attempts", len(relevant_by_link))
+                break
+            elif retry_count >= 1 and relevance_rate >= self.relevance_threshold * 0.85:
+                logger.info("Relevance rate %.1f%% is close to the threshold, skipping further refinement", relevance_rate * 100)
                 break
             else:
-                logger.warning(f"⚠️ Low relevance rate: {relevance_rate:.1%}")
+                logger.warning("⚠️ Low relevance rate: %.1f%%", relevance_rate * 100)
                 if retry_count < self.max_retries - 1:
-                    current_query = self.refine_search_query(search_query, evaluated_results)
+                    current_query = await self.refine_search_query(search_query, evaluated_results)
                     retry_count += 1
                     continue
                 else:
@@ -396,65 +741,50 @@ class EnhancedLeadGenerationTool:
                     break
         
         # Step 4: Process the best results
+        relevant_results = list(relevant_by_link.values())
         final_results = relevant_results[:num_results] if relevant_results else evaluated_results[:num_results]
         
         if not final_results:
             logger.error("❌ No results to process")
             return pd.DataFrame()
         
-        # Step 5: Scrape and extract leads
+        # Step 5: Fetch pages and extract leads concurrently
         all_leads = []
+        extracted_leads = await asyncio.gather(*(self._fetch_and_extract(result['link']) for result in final_results))
         
-        for i, result in enumerate(final_results, 1):
-            logger.info(f"\n[{i}/{len(final_results)}] Processing: {result['title']}")
+        for i, (result, lead_data) in enumerate(zip(final_results, extracted_leads), 1):
+            logger.info("\n[%s/%d] Processing: %s", i, len(final_results), result['title'])
             
-            # Scrape website content
-            content = self.scrape_website(result['link'])
-            
-            if content:
-                # Extract lead information
-                lead_data = self.extract_lead_info(content, result['link'])
-                
-                # Add metadata
-                lead_data['search_title'] = result['title']
-                lead_data['search_snippet'] = result.get('snippet', '')
-                lead_data['is_relevant'] = result.get('is_relevant', False)
-                lead_data['relevance_confidence'] = result.get('relevance_confidence', 0.0)
-                lead_data['relevance_reason'] = result.get('relevance_reason', '')
-                lead_data['scraped_at'] = datetime.now().isoformat()
-                
-                all_leads.append(lead_data)
-                
-                logger.info(f"✅ Lead extracted: {lead_data.get('company_name', 'Unknown')}")
-            else:
+            if lead_data is None:
                 logger.warning("❌ Failed to scrape content")
+                continue
             
-            # Respectful delay
-            time.sleep(2)
+            # Add metadata
+            lead_data['search_title'] = result['title']
+            lead_data['search_snippet'] = result.get('snippet', '')
+            lead_data['is_relevant'] = result.get('is_relevant', False)
+            lead_data['relevance_confidence'] = result.get('relevance_confidence', 0.0)
+            lead_data['relevance_reason'] = result.get('relevance_reason', '')
+            lead_data['scraped_at'] = datetime.now().isoformat()
+            
+            # Fill fields the LLM left out so every lead matches the fixed schema
+            for column in _LEAD_COLUMNS:
+                lead_data.setdefault(column, "N/A")
+            
+            all_leads.append(lead_data)
+            
+            logger.info("✅ Lead extracted: %s", lead_data.get('company_name', 'Unknown'))
         
         # Step 6: Create DataFrame
         if all_leads:
-            df = pd.DataFrame(all_leads)
-            
-            # Reorder columns for better readability
-            column_order = [
-                "company_name", "email", "phone", "linkedin", "website", "industry", 
-                "description", "address", "contact_person", "services", "company_size",
-                "founded_year", "revenue_range", "technologies", "social_media",
-                "is_relevant", "relevance_confidence", "relevance_reason", 
-                "search_title", "search_snippet", "scraped_at"
-            ]
+            df = pd.DataFrame.from_records(all_leads, columns=list(_LEAD_COLUMNS))
             
-            # Reorder columns if they exist
-            available_columns = [col for col in column_order if col in df.columns]
-            df = df[available_columns]
-            
-            logger.info(f"\n🎉 Lead generation complete! {len(all_leads)} leads generated")
+            logger.info("\n🎉 Lead generation complete! %d leads generated", len(all_leads))
             
             # Display summary
             logger.info("\n📊 SUMMARY:")
             relevant_leads = df[df['is_relevant'] == True] if 'is_relevant' in df.columns else df
-            logger.info(f"Relevant leads: {len(relevant_leads)}/{len(df)}")
+            logger.info("Relevant leads: %d/%d", len(relevant_leads), len(df))
             
             return df
         else:
@@ -474,8 +804,14 @@ def generate_leads(search_query: str, num_results: int = 5) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame containing lead information
     """
-    tool = EnhancedLeadGenerationTool()
-    return tool.generate_leads_dataframe(search_query, num_results)
+    with EnhancedLeadGenerationTool() as tool:
+        return tool.generate_leads_dataframe(search_query, num_results)
+
+
+def clear_caches() -> None:
+    """Clear the on-disk page and Groq response caches shared by all runs"""
+    with EnhancedLeadGenerationTool() as tool:
+        tool.clear_caches()
 
 
 # Example usage